@@ -1,6 +1,7 @@
 import pandas as pd
 import logging
 from models import MediaProfile
+from normalizer import CanonicalRecord, PayloadNormalizer
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -11,8 +12,15 @@ class MediaProfileAnalyzer:
     media personality profiles.
     """
     
-    def __init__(self):
-        """Initialize the analyzer with profile types and trait categories."""
+    def __init__(self, normalizer=None):
+        """
+        Initialize the analyzer with profile types and trait categories.
+        
+        Args:
+            normalizer (PayloadNormalizer, optional): Converts webhook payloads to answer records.
+        """
+        self.normalizer = normalizer or PayloadNormalizer()
+        
         # Define media consumption personality profile types
         self.profile_types = {
             "Digital Native": "You were born into the digital age and navigate various media platforms with ease.",
@@ -35,6 +43,17 @@ class MediaProfileAnalyzer:
             "social_media_engagement"
         ]
         
+        # Map each trait category to the profile type it indicates
+        self.profile_mapping = {
+            "digital_engagement": "Digital Native",
+            "traditional_media_preference": "Classic Consumer",
+            "content_creation_tendency": "Content Creator",
+            "information_seeking": "Information Seeker",
+            "entertainment_focus": "Entertainment Enthusiast",
+            "consumption_balance": "Balanced Consumer",
+            "social_media_engagement": "Social Media Maven"
+        }
+        
         # Define descriptions for trait scores
         self.trait_descriptions = {
             "digital_engagement": {
@@ -127,11 +146,8 @@ class MediaProfileAnalyzer:
             # Extract the submission ID
             submission_id = response_data.get('id', 'unknown')
             
-            # Extract the actual form data
-            if 'data' in response_data:
-                form_data = response_data['data']
-            else:
-                form_data = response_data  # The data might be at the top level
+            # Extract the actual form data as a canonical answer record
+            form_data = self.normalizer.normalize(response_data)
             
             logger.debug(f"Analyzing data for submission {submission_id}: {form_data}")
             
@@ -174,84 +190,99 @@ class MediaProfileAnalyzer:
         Returns:
             dict: Scores for each trait category (0-100).
         """
-        # Initialize scores
-        trait_scores = {
-            "digital_engagement": 50,
-            "traditional_media_preference": 50,
-            "content_creation_tendency": 50,
-            "information_seeking": 50,
-            "entertainment_focus": 50,
-            "consumption_balance": 50,
-            "social_media_engagement": 50
+        adjustments = self._calculate_trait_adjustments(form_data)
+        
+        # Start every trait at 50 and ensure all scores are within 0-100 range
+        return {
+            trait: max(0, min(100, 50 + adjustment))
+            for trait, adjustment in adjustments.items()
+        }
+    
+    def _calculate_trait_adjustments(self, form_data):
+        """
+        Calculate how the survey responses move each trait away from 50.
+        
+        Each field adds its own adjustments independently of the others, and
+        nothing is clamped here.
+        
+        Args:
+            form_data (dict): The form response data.
+            
+        Returns:
+            dict: Unclamped adjustment for each trait category.
+        """
+        # Initialize adjustments
+        adjustments = {
+            "digital_engagement": 0,
+            "traditional_media_preference": 0,
+            "content_creation_tendency": 0,
+            "information_seeking": 0,
+            "entertainment_focus": 0,
+            "consumption_balance": 0,
+            "social_media_engagement": 0
         }
         
         # Analyze TV watching habits
-        if 'tv_hours' in form_data:
-            try:
-                tv_hours = float(form_data['tv_hours'])
-                # More TV hours increases entertainment focus and traditional media
-                trait_scores["entertainment_focus"] += min(tv_hours * 5, 30)
-                trait_scores["traditional_media_preference"] += min(tv_hours * 4, 25)
-            except (ValueError, TypeError):
-                pass
+        tv_hours = self._get_hours(form_data, 'tv_hours')
+        if tv_hours is not None:
+            # More TV hours increases entertainment focus and traditional media
+            adjustments["entertainment_focus"] += min(tv_hours * 5, 30)
+            adjustments["traditional_media_preference"] += min(tv_hours * 4, 25)
         
         # Analyze movie watching frequency
         if 'movie_frequency' in form_data:
             movie_freq = form_data['movie_frequency']
             if movie_freq == 'daily':
-                trait_scores["entertainment_focus"] += 20
-                trait_scores["consumption_balance"] -= 10
+                adjustments["entertainment_focus"] += 20
+                adjustments["consumption_balance"] -= 10
             elif movie_freq == 'weekly':
-                trait_scores["entertainment_focus"] += 10
-                trait_scores["consumption_balance"] += 5
+                adjustments["entertainment_focus"] += 10
+                adjustments["consumption_balance"] += 5
         
         # Analyze book reading habits
         if 'book_frequency' in form_data:
             book_freq = form_data['book_frequency']
             if book_freq == 'daily':
-                trait_scores["traditional_media_preference"] += 20
-                trait_scores["information_seeking"] += 15
-                trait_scores["digital_engagement"] -= 10
+                adjustments["traditional_media_preference"] += 20
+                adjustments["information_seeking"] += 15
+                adjustments["digital_engagement"] -= 10
             elif book_freq == 'weekly':
-                trait_scores["traditional_media_preference"] += 10
-                trait_scores["information_seeking"] += 10
+                adjustments["traditional_media_preference"] += 10
+                adjustments["information_seeking"] += 10
         
         # Analyze news consumption
         if 'news_source' in form_data:
             news_source = form_data['news_source']
-            trait_scores["information_seeking"] += 15
+            adjustments["information_seeking"] += 15
             if news_source == 'print':
-                trait_scores["traditional_media_preference"] += 20
-                trait_scores["digital_engagement"] -= 10
+                adjustments["traditional_media_preference"] += 20
+                adjustments["digital_engagement"] -= 10
             elif news_source == 'online':
-                trait_scores["digital_engagement"] += 15
-                trait_scores["traditional_media_preference"] -= 5
+                adjustments["digital_engagement"] += 15
+                adjustments["traditional_media_preference"] -= 5
             elif news_source == 'social_media':
-                trait_scores["social_media_engagement"] += 20
-                trait_scores["digital_engagement"] += 10
+                adjustments["social_media_engagement"] += 20
+                adjustments["digital_engagement"] += 10
         
         # Analyze social media usage
-        if 'social_media_hours' in form_data:
-            try:
-                sm_hours = float(form_data['social_media_hours'])
-                trait_scores["social_media_engagement"] += min(sm_hours * 8, 40)
-                trait_scores["digital_engagement"] += min(sm_hours * 5, 30)
-                # High social media use might reduce consumption balance
-                if sm_hours > 4:
-                    trait_scores["consumption_balance"] -= 15
-            except (ValueError, TypeError):
-                pass
+        sm_hours = self._get_hours(form_data, 'social_media_hours')
+        if sm_hours is not None:
+            adjustments["social_media_engagement"] += min(sm_hours * 8, 40)
+            adjustments["digital_engagement"] += min(sm_hours * 5, 30)
+            # High social media use might reduce consumption balance
+            if sm_hours > 4:
+                adjustments["consumption_balance"] -= 15
         
         # Analyze podcast consumption
         if 'podcast_frequency' in form_data:
             podcast_freq = form_data['podcast_frequency']
-            trait_scores["digital_engagement"] += 10
+            adjustments["digital_engagement"] += 10
             if podcast_freq == 'daily':
-                trait_scores["information_seeking"] += 15 
-                trait_scores["consumption_balance"] += 10
+                adjustments["information_seeking"] += 15 
+                adjustments["consumption_balance"] += 10
             elif podcast_freq == 'weekly':
-                trait_scores["information_seeking"] += 10
-                trait_scores["consumption_balance"] += 5
+                adjustments["information_seeking"] += 10
+                adjustments["consumption_balance"] += 5
         
         # Analyze genre preferences
         if 'genre_preference' in form_data:
@@ -263,42 +294,61 @@ class MediaProfileAnalyzer:
             
             # More diverse genres indicate better consumption balance
             if len(genres) > 2:
-                trait_scores["consumption_balance"] += 15
+                adjustments["consumption_balance"] += 15
             
             for genre in genres:
                 if genre.lower() in ['news', 'documentary', 'educational']:
-                    trait_scores["information_seeking"] += 10
+                    adjustments["information_seeking"] += 10
                 elif genre.lower() in ['comedy', 'drama', 'action', 'romance']:
-                    trait_scores["entertainment_focus"] += 10
+                    adjustments["entertainment_focus"] += 10
         
         # Analyze content creation habits
         if 'content_creation' in form_data:
             creation = form_data['content_creation']
             if creation == 'frequently':
-                trait_scores["content_creation_tendency"] += 30
-                trait_scores["digital_engagement"] += 15
+                adjustments["content_creation_tendency"] += 30
+                adjustments["digital_engagement"] += 15
             elif creation == 'sometimes':
-                trait_scores["content_creation_tendency"] += 20
-                trait_scores["digital_engagement"] += 10
+                adjustments["content_creation_tendency"] += 20
+                adjustments["digital_engagement"] += 10
             elif creation == 'rarely':
-                trait_scores["content_creation_tendency"] += 5
+                adjustments["content_creation_tendency"] += 5
         
         # Analyze binge-watching tendencies
         if 'binge_watching' in form_data:
             binge = form_data['binge_watching']
             if binge == 'frequently':
-                trait_scores["entertainment_focus"] += 20
-                trait_scores["consumption_balance"] -= 15
-                trait_scores["digital_engagement"] += 10
+                adjustments["entertainment_focus"] += 20
+                adjustments["consumption_balance"] -= 15
+                adjustments["digital_engagement"] += 10
             elif binge == 'occasionally':
-                trait_scores["entertainment_focus"] += 10
-                trait_scores["consumption_balance"] -= 5
+                adjustments["entertainment_focus"] += 10
+                adjustments["consumption_balance"] -= 5
+        
+        return adjustments
+    
+    def _get_hours(self, form_data, field):
+        """
+        Get an hours answer as a number.
+        
+        Args:
+            form_data (dict): The form response data.
+            field (str): The hours field to read.
+            
+        Returns:
+            float: The hours, or None if the answer is missing or not a number.
+        """
+        if field not in form_data:
+            return None
         
-        # Ensure all scores are within 0-100 range
-        for trait in trait_scores:
-            trait_scores[trait] = max(0, min(100, trait_scores[trait]))
+        # Records from a compiled form plan already hold floats
+        if isinstance(form_data, CanonicalRecord):
+            return form_data[field]
         
-        return trait_scores
+        try:
+            return float(form_data[field])
+        except (ValueError, TypeError):
+            return None
     
     def _determine_profile_type(self, trait_scores):
         """
@@ -313,19 +363,8 @@ class MediaProfileAnalyzer:
         # Find the highest scoring trait
         primary_trait = max(trait_scores.items(), key=lambda x: x[1])
         
-        # Map trait categories to profile types
-        profile_mapping = {
-            "digital_engagement": "Digital Native",
-            "traditional_media_preference": "Classic Consumer",
-            "content_creation_tendency": "Content Creator",
-            "information_seeking": "Information Seeker",
-            "entertainment_focus": "Entertainment Enthusiast",
-            "consumption_balance": "Balanced Consumer",
-            "social_media_engagement": "Social Media Maven"
-        }
-        
         # Return the corresponding profile type
-        return profile_mapping.get(primary_trait[0], "Balanced Consumer")
+        return self.profile_mapping.get(primary_trait[0], "Balanced Consumer")
     
     def _generate_trait_descriptions(self, trait_scores):
         """
@@ -1,9 +1,13 @@
 import os
+import hmac
 import logging
 import json
 from flask import Flask, request, render_template, redirect, url_for, flash, session
 from models import MediaProfile, ResponseStorage
 from analyzer import MediaProfileAnalyzer
+from normalizer import PayloadNormalizer, load_form_mappings
+from sensitivity import SensitivityAnalyzer
+from memory_accounting import memory_report, start_tracing, top_allocations
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -13,11 +17,33 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "default-dev-secret")
 
+# Enable memory accounting and allocation tracing when requested
+memory_accounting = os.environ.get("MEMORY_ACCOUNTING", "").lower() in ("1", "true", "yes")
+if memory_accounting:
+    start_tracing()
+
 # Initialize in-memory storage
 response_storage = ResponseStorage()
 
+# Initialize payload normalizer with any hand-maintained Paperform field mappings
+form_mappings_path = os.environ.get("PAPERFORM_FIELD_MAPS")
+payload_normalizer = PayloadNormalizer(load_form_mappings(form_mappings_path) if form_mappings_path else None)
+
 # Initialize analyzer
-analyzer = MediaProfileAnalyzer()
+analyzer = MediaProfileAnalyzer(normalizer=payload_normalizer)
+
+# Initialize what-if analysis over the same scoring
+sensitivity_analyzer = SensitivityAnalyzer(analyzer)
+
+# Initialize the optional profile clustering engine
+profile_clusterer = None
+if os.environ.get("PROFILE_CLUSTERING", "").lower() in ("1", "true", "yes"):
+    from clustering import ProfileClusterer
+    profile_clusterer = ProfileClusterer(
+        n_clusters=int(os.environ.get("PROFILE_CLUSTERS", len(analyzer.profile_types))),
+        batch_size=int(os.environ.get("PROFILE_CLUSTER_BATCH", 32)),
+        traits=analyzer.trait_categories
+    )
 
 @app.route('/')
 def index():
@@ -42,18 +68,24 @@ def webhook():
         # Process the form submission
         submission_id = data.get('id', str(len(response_storage.responses) + 1))
         
-        # Store the response data
-        response_storage.add_response(submission_id, data)
-        
         # Process the response to generate a media profile
         profile = analyzer.analyze_response(data)
         
-        # Store the profile
+        # Store the response data and its profile
+        response_storage.add_response(submission_id, data)
         response_storage.add_profile(submission_id, profile)
         
+        # Feed the profile to the clustering engine
+        if profile_clusterer is not None:
+            profile_clusterer.add_profile(profile)
+        
         logger.info(f"Successfully processed submission {submission_id}")
         return {"status": "success", "submission_id": submission_id}, 200
     
+    except ValueError as e:
+        logger.error(f"Rejected webhook payload: {str(e)}")
+        return {"status": "error", "message": str(e)}, 400
+    
     except Exception as e:
         logger.error(f"Error processing webhook: {str(e)}")
         return {"status": "error", "message": str(e)}, 500
@@ -119,5 +151,109 @@ def demo():
         flash("An error occurred while generating a demo profile.", "danger")
         return render_template('error.html', error=str(e)), 500
 
+@app.route('/sensitivity', methods=['POST'])
+@app.route('/sensitivity/<submission_id>')
+def sensitivity(submission_id=None):
+    """
+    Score how single (or, with ?pairwise=1, paired) answer changes move a
+    response's traits and profile type. Accepts a stored submission ID or a
+    posted response payload; ?changed_only=1 keeps only profile type changes.
+    """
+    try:
+        if submission_id is not None:
+            data = response_storage.get_response(submission_id)
+            if not data:
+                return {"status": "error", "message": "Response not found"}, 404
+        else:
+            data = request.json
+            if not data:
+                return {"status": "error", "message": "No data received"}, 400
+        
+        pairwise = request.args.get('pairwise', '').lower() in ('1', 'true', 'yes')
+        changed_only = request.args.get('changed_only', '').lower() in ('1', 'true', 'yes')
+        
+        result = sensitivity_analyzer.analyze(data, pairwise=pairwise, changed_only=changed_only)
+        return {"status": "success", **result}, 200
+    
+    except ValueError as e:
+        logger.error(f"Rejected sensitivity payload: {str(e)}")
+        return {"status": "error", "message": str(e)}, 400
+    
+    except Exception as e:
+        logger.error(f"Error running sensitivity analysis: {str(e)}")
+        return {"status": "error", "message": str(e)}, 500
+
+@app.route('/clusters')
+def clusters():
+    """
+    Report the learned profile clusters alongside the fixed profile types.
+    Only available when the clustering engine is enabled.
+    """
+    if profile_clusterer is None:
+        return {"status": "error", "message": "Profile clustering is not enabled"}, 404
+    
+    return {
+        "status": "success",
+        "ready": profile_clusterer.is_ready,
+        "pending": profile_clusterer.pending_count,
+        "clusters": profile_clusterer.compare_profile_types()
+    }, 200
+
+@app.route('/clusters/<submission_id>')
+def submission_cluster(submission_id):
+    """
+    Assign a stored submission's profile to its nearest learned cluster.
+    Only available when the clustering engine is enabled.
+    """
+    if profile_clusterer is None:
+        return {"status": "error", "message": "Profile clustering is not enabled"}, 404
+    
+    profile = response_storage.get_profile(submission_id)
+    if not profile:
+        return {"status": "error", "message": "Profile not found"}, 404
+    
+    return {
+        "status": "success",
+        "submission_id": submission_id,
+        "profile_type": profile.profile_type,
+        "cluster": profile_clusterer.predict(profile.traits)
+    }, 200
+
+@app.route('/admin/memory')
+def admin_memory():
+    """
+    Report approximate memory use by component, plus the top traced allocation
+    sites. Only available when memory accounting is enabled; ?entries=1 adds a
+    per-submission breakdown and ?top=N sets the number of allocation sites.
+    Requests must send the ADMIN_TOKEN value in the X-Admin-Token header.
+    """
+    if not memory_accounting:
+        return {"status": "error", "message": "Memory accounting is not enabled"}, 404
+    
+    admin_token = os.environ.get("ADMIN_TOKEN")
+    if not admin_token:
+        logger.warning("Memory report requested but ADMIN_TOKEN is not set")
+        return {"status": "error", "message": "Admin access is not configured"}, 403
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), admin_token):
+        return {"status": "error", "message": "Invalid admin token"}, 403
+    
+    try:
+        caches = {
+            "normalizer_plans": payload_normalizer.compiled_plans,
+            "sensitivity_effects": sensitivity_analyzer.option_effects
+        }
+        if profile_clusterer is not None:
+            caches["profile_clusterer"] = profile_clusterer
+        
+        include_entries = request.args.get('entries', '').lower() in ('1', 'true', 'yes')
+        report = memory_report(response_storage, analyzer=analyzer, caches=caches,
+                               include_entries=include_entries)
+        report["top_allocations"] = top_allocations(request.args.get('top', 10, type=int))
+        return {"status": "success", **report}, 200
+    
+    except Exception as e:
+        logger.error(f"Error building memory report: {str(e)}")
+        return {"status": "error", "message": str(e)}, 500
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
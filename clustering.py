@@ -0,0 +1,195 @@
+import logging
+import threading
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Trait order used for the cluster vectors
+TRAIT_ORDER = [
+    "digital_engagement",
+    "traditional_media_preference",
+    "content_creation_tendency",
+    "information_seeking",
+    "entertainment_focus",
+    "consumption_balance",
+    "social_media_engagement"
+]
+
+
+class ProfileClusterer:
+    """
+    Learns profile groupings from trait vectors with mini-batch k-means.
+
+    Profiles are buffered as they arrive and folded into the centroids one
+    batch at a time, so the model is never re-fit over the full history.
+    Assigning a profile to a cluster only compares it with the k centroids.
+    All public methods hold a lock, since the webhook runs on several threads.
+    """
+
+    def __init__(self, n_clusters=7, batch_size=32, traits=None):
+        """
+        Initialize the clusterer.
+
+        Args:
+            n_clusters (int, optional): Number of clusters to learn.
+            batch_size (int, optional): Number of profiles per centroid update.
+            traits (list, optional): Trait categories, in vector order.
+        """
+        if n_clusters < 1 or batch_size < 1:
+            raise ValueError("n_clusters and batch_size must be positive")
+
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.traits = list(traits or TRAIT_ORDER)
+
+        self.centroids = None  # (n_clusters, n_traits) once initialized
+        self.seeded = np.zeros(n_clusters, dtype=bool)  # clusters placed on a real profile
+        self.counts = np.zeros(n_clusters, dtype=np.int64)
+        self.profile_type_counts = [{} for _ in range(n_clusters)]
+        self._pending = []  # (vector, profile_type) not yet folded into the centroids
+        self._lock = threading.RLock()
+
+    @property
+    def is_ready(self):
+        """Whether enough profiles have arrived to initialize the centroids."""
+        return self.centroids is not None
+
+    @property
+    def pending_count(self):
+        """Number of profiles waiting for the next mini-batch update."""
+        with self._lock:
+            return len(self._pending)
+
+    def to_vector(self, trait_scores):
+        """Convert a trait score dict to a vector in trait order."""
+        return np.array([trait_scores.get(trait, 0) for trait in self.traits], dtype=np.float64)
+
+    def add_profile(self, profile):
+        """
+        Queue a profile for the next mini-batch update.
+
+        Args:
+            profile (MediaProfile): The newly generated profile.
+        """
+        vector = self.to_vector(profile.traits)
+
+        with self._lock:
+            self._pending.append((vector, profile.profile_type))
+
+            threshold = self.batch_size if self.is_ready else max(self.batch_size, self.n_clusters)
+            if len(self._pending) >= threshold:
+                self.flush()
+
+    def flush(self):
+        """Fold all pending profiles into the centroids."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if pending:
+                self._update(pending)
+
+    def _update(self, pending):
+        """Fold a batch of (vector, profile_type) pairs into the centroids."""
+        batch = np.vstack([vector for vector, _ in pending])
+        profile_types = [profile_type for _, profile_type in pending]
+
+        if not self.is_ready:
+            self.centroids = np.zeros((self.n_clusters, len(self.traits)))
+        if not self.seeded.all():
+            self._seed(batch)
+
+        assignments = self._assign(batch)
+
+        # Move each centroid to the running mean of every vector assigned to it
+        batch_counts = np.bincount(assignments, minlength=self.n_clusters)
+        batch_sums = np.zeros_like(self.centroids)
+        np.add.at(batch_sums, assignments, batch)
+
+        updated = batch_counts > 0
+        new_counts = self.counts + batch_counts
+        self.centroids[updated] = (
+            self.centroids[updated] * self.counts[updated][:, None] + batch_sums[updated]
+        ) / new_counts[updated][:, None]
+        self.counts = new_counts
+
+        for cluster, profile_type in zip(assignments, profile_types):
+            type_counts = self.profile_type_counts[cluster]
+            type_counts[profile_type] = type_counts.get(profile_type, 0) + 1
+
+        logger.debug(f"Updated {int(updated.sum())} centroids from a batch of {len(batch)} profiles")
+
+    def predict(self, trait_scores):
+        """
+        Assign trait scores to the nearest cluster.
+
+        Args:
+            trait_scores (dict): Scores for each trait category.
+
+        Returns:
+            int: The cluster index, or None if the centroids are not initialized.
+        """
+        vector = self.to_vector(trait_scores)
+
+        with self._lock:
+            if not self.is_ready:
+                return None
+            return int(self._assign(vector[None, :])[0])
+
+    def get_centroids(self):
+        """Get the cluster centroids as trait score dicts, None for clusters not yet seeded."""
+        with self._lock:
+            if not self.is_ready:
+                return []
+            return [
+                {trait: round(float(score), 2) for trait, score in zip(self.traits, centroid)}
+                if seeded else None
+                for centroid, seeded in zip(self.centroids, self.seeded)
+            ]
+
+    def compare_profile_types(self):
+        """
+        Compare learned clusters with the fixed profile types.
+
+        Returns:
+            list: Per cluster, its size, centroid, and profile type counts.
+        """
+        with self._lock:
+            return [
+                {
+                    "cluster": cluster,
+                    "size": int(self.counts[cluster]),
+                    "centroid": centroid,
+                    "profile_types": dict(self.profile_type_counts[cluster])
+                }
+                for cluster, centroid in enumerate(self.get_centroids())
+            ]
+
+    def _seed(self, batch):
+        """
+        Place unseeded clusters on the batch profiles farthest from every seeded centroid.
+
+        Clusters stay unseeded while there are fewer distinct profiles than
+        clusters, and are seeded from later batches once new profiles arrive.
+        """
+        for cluster in np.flatnonzero(~self.seeded):
+            if self.seeded.any():
+                nearest = self._distances(batch).min(axis=1)
+            else:
+                nearest = np.ones(len(batch))  # The first cluster takes the first profile
+            farthest = int(nearest.argmax())
+            if nearest[farthest] <= 0:
+                break
+            self.centroids[cluster] = batch[farthest]
+            self.seeded[cluster] = True
+
+        logger.debug(f"{int(self.seeded.sum())} of {self.n_clusters} clusters seeded")
+
+    def _distances(self, vectors):
+        """Squared distance from each vector to each centroid, infinite for unseeded clusters."""
+        distances = ((vectors[:, None, :] - self.centroids[None, :, :]) ** 2).sum(axis=2)
+        distances[:, ~self.seeded] = np.inf
+        return distances
+
+    def _assign(self, vectors):
+        """Return the index of the nearest seeded centroid for each vector."""
+        return self._distances(vectors).argmin(axis=1)
@@ -0,0 +1,282 @@
+import argparse
+import json
+import logging
+import random
+import sys
+import tracemalloc
+from analyzer import MediaProfileAnalyzer
+from models import ResponseStorage
+from normalizer import FIELD_TYPES, PayloadNormalizer
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Answers used for synthetic soak submissions
+SOAK_ANSWERS = {
+    "number": ["0", "1", "2.5", "4", "6"],
+    "text": ["daily", "weekly", "monthly", "frequently", "sometimes", "occasionally", "rarely", "online", "print"],
+    "choices": ["news", "documentary", "comedy", "drama", "action", "romance"]
+}
+
+# Soak form registered with a field mapping, so its records are built by the normalizer
+SOAK_MAPPED_FORM = "soak-mapped"
+SOAK_FIELD_MAP = {f"q_{name}": name for name in FIELD_TYPES}
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Approximate the memory used by an object and everything it references.
+
+    Args:
+        obj: The object to measure.
+        seen (set, optional): IDs of objects already counted, which are skipped.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+    if seen is None:
+        seen = set()
+
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, '__dict__') and not isinstance(current, type):
+            stack.append(current.__dict__)
+
+    return size
+
+
+def analyzer_shared_ids(analyzer):
+    """
+    Collect the IDs of the analyzer's tables that every profile references.
+
+    Profiles point at the analyzer's description strings and recommendation
+    lists rather than copying them, so they are not part of a profile's cost.
+
+    Args:
+        analyzer (MediaProfileAnalyzer): The analyzer that built the profiles.
+
+    Returns:
+        set: IDs of the shared objects.
+    """
+    shared = set()
+    for table in (analyzer.trait_categories, analyzer.profile_mapping, analyzer.profile_types,
+                  analyzer.trait_descriptions, analyzer.recommendations):
+        deep_sizeof(table, shared)
+    return shared
+
+
+def entry_memory(storage, submission_id, shared_ids=None):
+    """
+    Approximate the memory used by one stored submission.
+
+    The raw payload is counted first, so profile data that references it
+    rather than copying it adds nothing to the profile's share.
+
+    Args:
+        storage (ResponseStorage): The response storage.
+        submission_id (str): The submission to measure.
+        shared_ids (set, optional): IDs of shared objects that are not counted.
+
+    Returns:
+        dict: Bytes per component, and their total.
+    """
+    seen = set(shared_ids or ())
+    sizes = {"raw_payload": deep_sizeof(storage.get_response(submission_id), seen)}
+
+    profile = storage.get_profile(submission_id)
+    if profile is not None:
+        sizes["profile_raw_data"] = deep_sizeof(profile.raw_data, seen)
+        sizes["insights"] = deep_sizeof(profile.personalized_insights, seen)
+        sizes["profile"] = deep_sizeof(profile, seen)
+
+    sizes["total"] = sum(sizes.values())
+    return sizes
+
+
+def memory_report(storage, analyzer=None, caches=None, include_entries=False):
+    """
+    Build a memory accounting report for stored submissions and caches.
+
+    Objects shared between components are only counted once, in the first
+    component that references them. The analyzer's tables that profiles
+    reference are not counted at all. Per-submission entries leave out
+    objects shared by several submissions; their total is shared_bytes.
+
+    Args:
+        storage (ResponseStorage): The response storage.
+        analyzer (MediaProfileAnalyzer, optional): The analyzer that built the profiles.
+        caches (dict, optional): Cache name -> cache object to include.
+        include_entries (bool, optional): Include a per-submission breakdown.
+
+    Returns:
+        dict: Totals by component, bytes per profile, and optional entries.
+    """
+    shared_ids = analyzer_shared_ids(analyzer) if analyzer is not None else set()
+    seen = set(shared_ids)
+    profiles = storage.get_all_profiles().values()
+
+    components = {
+        "raw_payloads": deep_sizeof(storage.get_all_responses(), seen),
+        "profile_raw_data": sum(deep_sizeof(profile.raw_data, seen) for profile in profiles),
+        "insights": sum(deep_sizeof(profile.personalized_insights, seen) for profile in profiles),
+        "profiles": deep_sizeof(storage.get_all_profiles(), seen)
+    }
+    components["caches"] = {
+        name: deep_sizeof(cache, seen) for name, cache in (caches or {}).items()
+    }
+
+    total = sum(size for name, size in components.items() if name != "caches")
+    total += sum(components["caches"].values())
+    profile_count = len(storage.get_all_profiles())
+
+    report = {
+        "responses": len(storage.get_all_responses()),
+        "profiles": profile_count,
+        "components": components,
+        "total_bytes": total,
+        "bytes_per_profile": (total - sum(components["caches"].values())) / profile_count if profile_count else 0
+    }
+
+    if include_entries:
+        # Objects reachable from more than one submission belong to none of them
+        shared_ids = shared_ids | _cross_entry_ids(storage, shared_ids)
+        report["entries"] = {
+            submission_id: entry_memory(storage, submission_id, shared_ids)
+            for submission_id in storage.get_all_responses()
+        }
+        report["shared_bytes"] = report["bytes_per_profile"] * profile_count - sum(
+            entry["total"] for entry in report["entries"].values())
+
+    return report
+
+
+def _cross_entry_ids(storage, exclude):
+    """Collect the IDs of objects reachable from more than one stored submission."""
+    reference_counts = {}
+    for submission_id in storage.get_all_responses():
+        reachable = set(exclude)
+        deep_sizeof((storage.get_response(submission_id), storage.get_profile(submission_id)), reachable)
+        for object_id in reachable - exclude:
+            reference_counts[object_id] = reference_counts.get(object_id, 0) + 1
+    return {object_id for object_id, count in reference_counts.items() if count > 1}
+
+
+def start_tracing(frames=1):
+    """Start tracemalloc if it is not already tracing."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        logger.info("Started tracemalloc allocation tracing")
+
+
+def top_allocations(limit=10):
+    """
+    Get the source lines holding the most traced memory.
+
+    Args:
+        limit (int, optional): Number of allocation sites to return.
+
+    Returns:
+        list: Allocation sites with their size and block count, largest first.
+    """
+    if not tracemalloc.is_tracing():
+        return []
+
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")
+    ])
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_bytes": stat.size,
+            "count": stat.count
+        }
+        for stat in snapshot.statistics('lineno')[:limit]
+    ]
+
+
+def synthetic_submission(index, rng):
+    """
+    Create a synthetic Paperform payload with random answers.
+
+    Odd-numbered submissions use the mapped soak form and Paperform's list
+    of field objects; the rest use an unregistered form with named answers.
+    """
+    answers = {}
+    for name, kind in FIELD_TYPES.items():
+        if kind == "choices":
+            answers[name] = ','.join(rng.sample(SOAK_ANSWERS[kind], rng.randint(1, 4)))
+        elif rng.random() < 0.8:
+            answers[name] = rng.choice(SOAK_ANSWERS[kind])
+
+    if index % 2:
+        data = [{"key": f"q_{name}", "value": value} for name, value in answers.items()]
+        return {"id": f"soak-{index}", "formId": SOAK_MAPPED_FORM, "data": data}
+    return {"id": f"soak-{index}", "formId": "soak", "data": answers}
+
+
+def soak(count, seed=0):
+    """
+    Ingest synthetic submissions the way the webhook does.
+
+    Args:
+        count (int): Number of submissions to ingest.
+        seed (int, optional): Random seed for the synthetic answers.
+
+    Returns:
+        tuple: (ResponseStorage holding the submissions, the analyzer used).
+    """
+    rng = random.Random(seed)
+    analyzer = MediaProfileAnalyzer(normalizer=PayloadNormalizer({SOAK_MAPPED_FORM: SOAK_FIELD_MAP}))
+    storage = ResponseStorage()
+
+    for index in range(count):
+        payload = synthetic_submission(index, rng)
+        storage.add_response(payload["id"], payload)
+        storage.add_profile(payload["id"], analyzer.analyze_response(payload))
+
+    return storage, analyzer
+
+
+def main(argv=None):
+    """Run a soak ingest and print its memory report."""
+    parser = argparse.ArgumentParser(description="Report memory used per stored submission.")
+    parser.add_argument("--count", type=int, default=1000, help="synthetic submissions to ingest")
+    parser.add_argument("--max-bytes-per-profile", type=float, default=None,
+                        help="fail if bytes per profile exceed this threshold")
+    parser.add_argument("--top", type=int, default=10, help="top allocation sites to show")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for synthetic answers")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    start_tracing()
+
+    storage, analyzer = soak(args.count, seed=args.seed)
+    report = memory_report(storage, analyzer=analyzer, caches={
+        "normalizer_plans": analyzer.normalizer.compiled_plans
+    })
+    report["top_allocations"] = top_allocations(args.top)
+    print(json.dumps(report, indent=2))
+
+    limit = args.max_bytes_per_profile
+    if limit is not None and report["bytes_per_profile"] > limit:
+        print(f"FAIL: {report['bytes_per_profile']:.0f} bytes per profile exceeds {limit:.0f}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,6 @@
+from normalizer import CanonicalRecord
+
+
 class MediaProfile:
     """Class to represent a user's media consumption personality profile."""
     
@@ -39,8 +42,13 @@ class MediaProfile:
             return insights
             
         # Media balance insights
-        tv_hours = self._safe_float(self.raw_data.get('tv_hours', 0))
-        social_media_hours = self._safe_float(self.raw_data.get('social_media_hours', 0))
+        if isinstance(self.raw_data, CanonicalRecord):
+            # Records from a compiled form plan already hold floats
+            tv_hours = self.raw_data.get('tv_hours', 0.0)
+            social_media_hours = self.raw_data.get('social_media_hours', 0.0)
+        else:
+            tv_hours = self._safe_float(self.raw_data.get('tv_hours', 0))
+            social_media_hours = self._safe_float(self.raw_data.get('social_media_hours', 0))
         book_frequency = self.raw_data.get('book_frequency', '')
         
         total_screen_time = tv_hours + social_media_hours
@@ -0,0 +1,240 @@
+import json
+import logging
+from utils import extract_form_data
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Canonical survey fields and the kind of answer each one holds
+FIELD_TYPES = {
+    "tv_hours": "number",
+    "social_media_hours": "number",
+    "movie_frequency": "text",
+    "book_frequency": "text",
+    "news_source": "text",
+    "podcast_frequency": "text",
+    "genre_preference": "choices",
+    "content_creation": "text",
+    "binge_watching": "text"
+}
+
+
+def _coerce_number(value):
+    """Convert a numeric answer to float, or None if it is not a number."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _coerce_text(value):
+    """Convert a single-choice answer to a string, or None if it is empty."""
+    if value is None or value == '':
+        return None
+    return str(value)
+
+
+def _coerce_choices(value):
+    """Convert a multiple-choice answer to the comma separated form used by the analyzer."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (list, tuple)):
+        return ','.join(str(choice) for choice in value)
+    return str(value)
+
+
+class CanonicalRecord(dict):
+    """
+    Answer record built by a compiled form plan.
+
+    Every value already has the type given by FIELD_TYPES, so consumers can
+    use it without re-validating.
+    """
+
+
+COERCERS = {
+    "number": _coerce_number,
+    "text": _coerce_text,
+    "choices": _coerce_choices
+}
+
+
+def _build_field_plan(field_map):
+    """
+    Build a field key -> (canonical name, coercer) lookup for a field mapping.
+
+    Canonical names are accepted as-is for fields the mapping does not cover,
+    so a mapped key and a canonical key never fill the same field.
+    """
+    mapped_names = set(field_map.values())
+    field_plan = {
+        name: (name, COERCERS[kind])
+        for name, kind in FIELD_TYPES.items() if name not in mapped_names
+    }
+    for key, name in field_map.items():
+        field_plan[key] = (name, COERCERS[FIELD_TYPES[name]])
+    return field_plan
+
+
+class PayloadNormalizer:
+    """
+    Converts Paperform webhook payloads into canonical answer records.
+
+    Forms are registered with a mapping from Paperform field keys to the
+    canonical field names in FIELD_TYPES. The first payload seen for a form
+    compiles that mapping into a lookup plan, which is cached and reused for
+    every later payload of the same form.
+    """
+
+    def __init__(self, form_mappings=None):
+        """
+        Initialize the normalizer.
+
+        Args:
+            form_mappings (dict, optional): formId -> {field key: canonical name}.
+        """
+        self.form_mappings = {}
+        self._plans = {}  # formId -> compiled plan
+        self._default_plan = _build_field_plan({})  # canonical names only, for unmapped forms
+
+        for form_id, field_map in (form_mappings or {}).items():
+            self.register_form(form_id, field_map)
+
+    @property
+    def compiled_plans(self):
+        """The compiled plans cached so far, keyed by formId."""
+        return self._plans
+
+    def register_form(self, form_id, field_map, data_path=('data',)):
+        """
+        Register the field mapping for a Paperform form.
+
+        Args:
+            form_id (str): The Paperform form ID.
+            field_map (dict): Paperform field key -> canonical field name.
+            data_path (tuple, optional): Keys leading to the answers in the payload.
+        """
+        unknown = [name for name in field_map.values() if name not in FIELD_TYPES]
+        if unknown:
+            raise ValueError(f"Unknown canonical fields for form {form_id}: {unknown}")
+
+        self.form_mappings[form_id] = (dict(field_map), tuple(data_path))
+        self._plans.pop(form_id, None)
+
+    def normalize(self, payload):
+        """
+        Convert a webhook payload into a canonical answer record.
+
+        Args:
+            payload (dict): The raw webhook payload from Paperform.
+
+        Returns:
+            dict: Canonical field name -> coerced answer.
+
+        Raises:
+            ValueError: If the payload holds no usable answers.
+        """
+        plan = self._get_plan(payload.get('formId'))
+        if plan is None:
+            return self._fallback(payload)
+
+        field_plan, data_path = plan
+        answers = payload
+        for key in data_path:
+            answers = answers.get(key) if isinstance(answers, dict) else None
+
+        if isinstance(answers, (dict, list)):
+            return self._apply_plan(field_plan, answers)
+
+        logger.warning(f"No answers found at {data_path} for form {payload.get('formId')}")
+        return self._fallback(payload)
+
+    def _fallback(self, payload):
+        """
+        Extract answers for a form without a compiled plan.
+
+        Named answers keep the generic extraction behavior. Paperform's list
+        of field objects is read with canonical field names as keys.
+        """
+        form_data = extract_form_data(payload)
+
+        if isinstance(form_data, list):
+            record = self._apply_plan(self._default_plan, form_data)
+            if not record:
+                raise ValueError("No recognized fields in form data for an unmapped form")
+            return record
+
+        if not isinstance(form_data, dict):
+            raise ValueError(f"Unusable form data of type {type(form_data).__name__}")
+
+        return form_data
+
+    def _apply_plan(self, field_plan, answers):
+        """
+        Convert answers to a canonical record in a single pass.
+
+        Args:
+            field_plan (dict): Field key -> (canonical name, coercer).
+            answers (dict or list): Named answers, or Paperform's list of field objects.
+
+        Returns:
+            CanonicalRecord: Canonical field name -> coerced answer.
+        """
+        # Paperform sends answers as a list of field objects; dicts are accepted too
+        if isinstance(answers, dict):
+            items = answers.items()
+        else:
+            items = (
+                (answer.get('key'), answer.get('value'))
+                for answer in answers if isinstance(answer, dict)
+            )
+
+        record = CanonicalRecord()
+        for key, value in items:
+            entry = field_plan.get(key)
+            if entry is None:
+                continue
+            name, coerce = entry
+            value = coerce(value)
+            if value is not None:
+                record[name] = value
+
+        return record
+
+    def _get_plan(self, form_id):
+        """Return the compiled plan for a form, compiling it on first use."""
+        plan = self._plans.get(form_id)
+        if plan is None and form_id in self.form_mappings:
+            plan = self._compile_plan(form_id)
+            self._plans[form_id] = plan
+        return plan
+
+    def _compile_plan(self, form_id):
+        """
+        Compile a form's field mapping into a lookup plan.
+
+        Args:
+            form_id (str): The Paperform form ID.
+
+        Returns:
+            tuple: (field key -> (canonical name, coercer), data path).
+        """
+        field_map, data_path = self.form_mappings[form_id]
+        field_plan = _build_field_plan(field_map)
+
+        logger.debug(f"Compiled field plan for form {form_id} with {len(field_plan)} keys")
+        return field_plan, data_path
+
+
+def load_form_mappings(path):
+    """
+    Load form field mappings from a JSON file.
+
+    Args:
+        path (str): Path to a JSON file of formId -> {field key: canonical name}.
+
+    Returns:
+        dict: The loaded form mappings.
+    """
+    with open(path) as mapping_file:
+        return json.load(mapping_file)
@@ -0,0 +1,200 @@
+import logging
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Candidate answers tried for each field; None means the question is left unanswered
+FIELD_OPTIONS = {
+    "tv_hours": [float(hours) for hours in range(0, 11)],
+    "social_media_hours": [float(hours) for hours in range(0, 11)],
+    "movie_frequency": ["daily", "weekly", "monthly", None],
+    "book_frequency": ["daily", "weekly", "monthly", None],
+    "news_source": ["print", "online", "social_media", "tv", None],
+    "podcast_frequency": ["daily", "weekly", "monthly", None],
+    "content_creation": ["frequently", "sometimes", "rarely", None],
+    "binge_watching": ["frequently", "occasionally", "rarely", None]
+}
+
+# Genres toggled on and off in the genre preference answer
+GENRE_OPTIONS = ["news", "documentary", "educational", "comedy", "drama", "action", "romance"]
+
+# Stands for a given answer that matches none of the candidate answers
+_OTHER_ANSWER = object()
+
+
+class SensitivityAnalyzer:
+    """
+    Scores every single-field (and optionally pairwise) answer change for a
+    response in one vectorized batch.
+
+    The analyzer's trait scores are a clamped sum of independent per-field
+    effects, so each candidate answer is reduced to a trait delta vector
+    once. Perturbed scores are then the base sum plus those deltas, clamped.
+    """
+
+    def __init__(self, analyzer):
+        """
+        Initialize the sensitivity analyzer.
+
+        Args:
+            analyzer (MediaProfileAnalyzer): The analyzer whose scoring is explored.
+        """
+        self.analyzer = analyzer
+        self.traits = list(analyzer.trait_categories)
+        self.profile_types = [analyzer.profile_mapping[trait] for trait in self.traits]
+        self._neutral = np.full(len(self.traits), 50.0)
+
+        # Trait effects of the fixed candidate answers, computed once
+        self._option_effects = {
+            (field, value): self._field_effect(field, value)
+            for field, values in FIELD_OPTIONS.items()
+            for value in values
+        }
+
+    @property
+    def option_effects(self):
+        """The precomputed trait effects of the candidate answers."""
+        return self._option_effects
+
+    def analyze(self, response_data, pairwise=False, changed_only=False):
+        """
+        Enumerate answer perturbations for a survey response.
+
+        Args:
+            response_data (dict): The survey response data from Paperform.
+            pairwise (bool, optional): Also score changes to two fields at once.
+            changed_only (bool, optional): Only return perturbations that change the profile type.
+
+        Returns:
+            dict: The base traits and profile type, and the scored perturbations.
+
+        Raises:
+            ValueError: If the response holds no usable answers.
+        """
+        form_data = self.analyzer.normalizer.normalize(response_data)
+
+        # Per-field effects of the current answers
+        base_effects = {field: self._effect(form_data, field) for field in FIELD_OPTIONS}
+        base_effects["genre_preference"] = self._answer_effect(form_data, "genre_preference")
+        base_raw = self._neutral + sum(base_effects.values())
+        base_scores = np.clip(base_raw, 0, 100)
+        base_type_index = int(base_scores.argmax())
+
+        # One row per candidate answer: its field, the change, and its trait delta
+        candidates = []
+        deltas = []
+        for field, change_value, effect in self._candidates(form_data):
+            candidates.append((field, change_value))
+            deltas.append(effect - base_effects[field])
+
+        if not candidates:
+            return self._result(base_scores, base_type_index, [])
+
+        deltas = np.vstack(deltas)
+        fields = np.array([field for field, _ in candidates])
+        changes = [[index] for index in range(len(candidates))]
+        raw = base_raw + deltas
+
+        if pairwise:
+            first, second = np.triu_indices(len(candidates), k=1)
+            distinct = fields[first] != fields[second]
+            first, second = first[distinct], second[distinct]
+            raw = np.vstack([raw, base_raw + deltas[first] + deltas[second]])
+            changes.extend([int(i), int(j)] for i, j in zip(first, second))
+
+        scores = np.clip(raw, 0, 100)
+        type_indices = scores.argmax(axis=1)
+        score_deltas = scores - base_scores
+
+        rows = np.arange(len(changes))
+        if changed_only:
+            rows = rows[type_indices != base_type_index]
+
+        perturbations = [
+            {
+                "changes": {candidates[index][0]: candidates[index][1] for index in changes[row]},
+                "traits": dict(zip(self.traits, scores[row].tolist())),
+                "deltas": dict(zip(self.traits, score_deltas[row].tolist())),
+                "profile_type": self.profile_types[type_indices[row]],
+                "profile_changed": bool(type_indices[row] != base_type_index)
+            }
+            for row in rows
+        ]
+
+        logger.debug(f"Scored {len(changes)} perturbations, returning {len(perturbations)}")
+        return self._result(base_scores, base_type_index, perturbations)
+
+    def _candidates(self, form_data):
+        """Yield (field, new answer, trait effect) for every alternative answer."""
+        for field, values in FIELD_OPTIONS.items():
+            current = self._current_value(form_data, field)
+            for value in values:
+                if value != current:
+                    yield field, value, self._option_effects[(field, value)]
+
+        # Genre changes add or remove one genre from the current selection
+        genres = form_data.get("genre_preference")
+        genres = genres.split(',') if isinstance(genres, str) and genres else []
+        for genre in GENRE_OPTIONS:
+            if genre in genres:
+                toggled = [selected for selected in genres if selected != genre]
+            else:
+                toggled = genres + [genre]
+            value = ','.join(toggled) or None
+            yield "genre_preference", value, self._field_effect("genre_preference", value)
+
+    def _current_value(self, form_data, field):
+        """
+        Express the current answer the way the candidate answers are written.
+
+        An unanswered field is None, matching the candidate that removes the
+        answer. A given answer that matches no candidate, including a null
+        one, is _OTHER_ANSWER.
+        """
+        if field not in form_data:
+            return None
+        value = form_data[field]
+        if isinstance(FIELD_OPTIONS[field][0], float):
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                return _OTHER_ANSWER
+        return _OTHER_ANSWER if value is None else value
+
+    def _effect(self, form_data, field):
+        """Get the trait effect of the current answer, reusing the precomputed candidate effects."""
+        try:
+            effect = self._option_effects.get((field, self._current_value(form_data, field)))
+        except TypeError:
+            effect = None  # Unhashable answers are never among the candidates
+        if effect is None:
+            effect = self._answer_effect(form_data, field)
+        return effect
+
+    def _answer_effect(self, form_data, field):
+        """Compute the trait effect of the current answer, counting any answer that is present."""
+        if field not in form_data:
+            return np.zeros(len(self.traits))
+        return self._adjustment_vector(field, form_data[field])
+
+    def _field_effect(self, field, value):
+        """Compute the trait effect of a candidate answer, where None removes the answer."""
+        if value is None:
+            return np.zeros(len(self.traits))
+        return self._adjustment_vector(field, value)
+
+    def _adjustment_vector(self, field, value):
+        """Get the analyzer's trait adjustments for one answer as a vector."""
+        adjustments = self.analyzer._calculate_trait_adjustments({field: value})
+        return np.array([adjustments[trait] for trait in self.traits], dtype=np.float64)
+
+    def _result(self, base_scores, base_type_index, perturbations):
+        """Assemble the sensitivity result."""
+        return {
+            "base": {
+                "traits": dict(zip(self.traits, base_scores.tolist())),
+                "profile_type": self.profile_types[base_type_index]
+            },
+            "perturbations": perturbations
+        }